@@ -4,51 +4,207 @@ GPU Memory Monitor for Telly Spelly
 Run this alongside telly-spelly to track VRAM usage over time.
 """
 
+import atexit
+import collections
 import subprocess
+import threading
 import time
 import sys
+import xml.etree.ElementTree as ET
 from datetime import datetime
 
+import numpy as np
+
+# Prefer in-process NVML queries over spawning nvidia-smi for every sample
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
+
+_nvml_handle = None
+if pynvml is not None:
+    try:
+        pynvml.nvmlInit()
+        _nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        atexit.register(pynvml.nvmlShutdown)
+    except pynvml.NVMLError as e:
+        print(f"NVML unavailable, falling back to nvidia-smi: {e}")
+
+SAMPLE_INTERVAL = 5  # seconds
+MAX_SAMPLES = 720    # ring buffer size for trend analysis
+TREND_WINDOW = 10    # samples considered for the "steadily increasing" warning
+FLUSH_EVERY = 10     # flush stdout every N printed samples
+
+_LINE = "[{ts}] Used: {u:5}MB / {t}MB  (+{d:+5}MB from start)  Peak: {p}MB  [{s}]{tm}\n"
+_TREND_WARNING = "  ^ WARNING: Memory usage steadily increasing!\n"
+
 def get_gpu_memory():
-    """Get current GPU memory usage using nvidia-smi"""
+    """Get current GPU memory usage via NVML (None without NVML; see _stream_samples)"""
+    if _nvml_handle is None:
+        return None
     try:
-        result = subprocess.run(
-            ['nvidia-smi', '--query-gpu=memory.used,memory.total,memory.free', '--format=csv,noheader,nounits'],
-            capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            used, total, free = map(int, result.stdout.strip().split(', '))
-            return {'used': used, 'total': total, 'free': free}
-    except Exception as e:
+        info = pynvml.nvmlDeviceGetMemoryInfo(_nvml_handle)
+        return {'used': info.used >> 20, 'total': info.total >> 20, 'free': info.free >> 20}
+    except pynvml.NVMLError as e:
         print(f"Error querying GPU: {e}")
-    return None
+        return None
+
+# (pid, starttime) -> is telly-spelly; starttime guards against PID reuse
+_cmdline_cache = {}
+
+def _process_starttime(pid):
+    """Read a process's start time (field 22 of /proc/<pid>/stat)"""
+    with open(f'/proc/{pid}/stat', 'r') as f:
+        stat = f.read()
+    # comm (field 2) may contain spaces, so split after its closing paren
+    return int(stat.rsplit(')', 1)[1].split()[19])
+
+def _is_telly_process(pid):
+    """Check whether a PID belongs to a telly-spelly process"""
+    try:
+        key = (pid, _process_starttime(pid))
+        cached = _cmdline_cache.get(key)
+        if cached is not None:
+            return cached
+        with open(f'/proc/{pid}/cmdline', 'r') as f:
+            cmdline = f.read()
+        is_telly = 'telly' in cmdline.lower() or 'whisper' in cmdline.lower()
+        _cmdline_cache[key] = is_telly
+        return is_telly
+    except (OSError, PermissionError, ProcessLookupError, ValueError, IndexError):
+        # Process may have exited or we don't have permission
+        return False
+
+def _evict_cmdline_cache(live_pids):
+    """Drop cache entries for processes no longer using the GPU"""
+    for key in [k for k in _cmdline_cache if k[0] not in live_pids]:
+        del _cmdline_cache[key]
 
 def get_telly_gpu_memory():
-    """Get GPU memory specifically used by telly-spelly processes"""
+    """Get GPU memory used by telly-spelly processes via NVML (None without NVML)"""
+    if _nvml_handle is None:
+        return None
+    try:
+        procs = pynvml.nvmlDeviceGetComputeRunningProcesses_v3(_nvml_handle)
+    except pynvml.NVMLError:
+        return None
+    telly_mem = 0
+    for proc in procs:
+        # usedGpuMemory is None when the driver can't report it (e.g. containers)
+        if proc.usedGpuMemory and _is_telly_process(proc.pid):
+            telly_mem += proc.usedGpuMemory >> 20
+    _evict_cmdline_cache({proc.pid for proc in procs})
+    return telly_mem
+
+def _poll_samples(interval, stop_event):
+    """Yield (mem, telly_mem) by querying the GPU every interval seconds"""
+    while not stop_event.is_set():
+        yield get_gpu_memory(), get_telly_gpu_memory()
+        stop_event.wait(interval)
+
+def _mib(text):
+    """Parse an nvidia-smi XML memory value like '1234 MiB' into an int"""
+    return int(text.split()[0])
+
+def _parse_gpu_element(gpu):
+    """Extract (mem, {pid: used_mem}) from a <gpu> element of nvidia-smi -q -x"""
+    mem = None
+    fb = gpu.find('fb_memory_usage')
+    if fb is not None:
+        try:
+            mem = {
+                'used': _mib(fb.findtext('used')),
+                'total': _mib(fb.findtext('total')),
+                'free': _mib(fb.findtext('free')),
+            }
+        except (AttributeError, ValueError, IndexError):
+            mem = None
+
+    apps = {}
+    for info in gpu.iterfind('processes/process_info'):
+        try:
+            apps[int(info.findtext('pid'))] = _mib(info.findtext('used_memory'))
+        except (TypeError, ValueError, IndexError):
+            pass
+    return mem, apps
+
+def _stream_samples(interval, stop_event):
+    """Yield (mem, telly_mem) from one long-lived nvidia-smi -q -x loop process
+
+    Spawning nvidia-smi per sample re-initializes the driver every time when
+    persistence mode is off; a single looping process only pays that once and
+    reports memory and compute apps together in each XML report.
+    """
+    proc = subprocess.Popen(
+        ['nvidia-smi', '-q', '-x', f'--loop-ms={int(interval * 1000)}'],
+        stdout=subprocess.PIPE, text=True, bufsize=1
+    )
+
     try:
-        result = subprocess.run(
-            ['nvidia-smi', '--query-compute-apps=pid,used_memory', '--format=csv,noheader,nounits'],
-            capture_output=True, text=True
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            telly_mem = 0
-            for line in result.stdout.strip().split('\n'):
-                parts = line.split(', ')
-                if len(parts) >= 2:
-                    pid, mem = int(parts[0]), int(parts[1])
-                    # Check if this PID is telly-spelly
-                    try:
-                        with open(f'/proc/{pid}/cmdline', 'r') as f:
-                            cmdline = f.read()
-                        if 'telly' in cmdline.lower() or 'whisper' in cmdline.lower():
-                            telly_mem += mem
-                    except (OSError, PermissionError, ProcessLookupError):
-                        # Process may have exited or we don't have permission
-                        pass
-            return telly_mem
-    except (subprocess.SubprocessError, ValueError, OSError):
-        pass
-    return None
+        parser = None
+        sample = None
+        for line in proc.stdout:
+            # Each loop iteration prints a complete XML document; parse them one at a time
+            if parser is None:
+                if not line.startswith('<?xml'):
+                    continue
+                parser = ET.XMLPullParser(events=('end',))
+
+            try:
+                parser.feed(line)
+                for _, elem in parser.read_events():
+                    if elem.tag == 'gpu' and sample is None:
+                        # Only the first GPU is monitored
+                        sample = _parse_gpu_element(elem)
+                    elif elem.tag == 'nvidia_smi_log':
+                        parser = None
+            except ET.ParseError:
+                parser = None
+                sample = None
+                continue
+
+            if parser is None and sample is not None:
+                mem, apps = sample
+                sample = None
+                telly_mem = sum(used_mem for pid, used_mem in apps.items() if _is_telly_process(pid))
+                _evict_cmdline_cache(apps.keys())
+
+                yield mem, telly_mem
+                if stop_event.is_set():
+                    break
+    finally:
+        proc.terminate()
+        proc.wait()
+
+class _Sampler(threading.Thread):
+    """Collects (timestamp, mem, telly_mem) samples in the background
+
+    Keeps GPU query latency off the thread that prints and analyzes samples,
+    so the sampling cadence doesn't drift.
+    """
+
+    def __init__(self, samples, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.samples = samples
+        self.interval = interval
+        self.error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        if _nvml_handle is not None:
+            source = _poll_samples(self.interval, self._stop_event)
+        else:
+            source = _stream_samples(self.interval, self._stop_event)
+        try:
+            for mem, telly_mem in source:
+                self.samples.append((time.monotonic(), mem, telly_mem))
+        except OSError as e:
+            self.error = e
+        finally:
+            source.close()
+
+    def stop(self):
+        self._stop_event.set()
 
 def main():
     print("GPU Memory Monitor for Telly Spelly")
@@ -58,51 +214,68 @@ def main():
 
     baseline = None
     peak = 0
-    samples = []
+    # Ring buffer of used-MB readings; sample_count is the linear write index
+    samples = np.empty(MAX_SAMPLES, dtype=np.uint32)
+    sample_count = 0
+    pending = collections.deque(maxlen=MAX_SAMPLES)
+    write = sys.stdout.write
+    lines_printed = 0
+
+    sampler = _Sampler(pending)
+    sampler.start()
 
     try:
-        while True:
-            mem = get_gpu_memory()
-            telly_mem = get_telly_gpu_memory()
+        while sampler.is_alive() or pending:
+            time.sleep(1)
 
-            if mem:
+            latest = None
+            while pending:
+                _, mem, telly_mem = pending.popleft()
+                if not mem:
+                    continue
                 if baseline is None:
                     baseline = mem['used']
-
                 peak = max(peak, mem['used'])
-                delta = mem['used'] - baseline
+                samples[sample_count % MAX_SAMPLES] = mem['used']
+                sample_count += 1
+                latest = (mem, telly_mem)
+
+            if latest is None:
+                continue
+            mem, telly_mem = latest
+            delta = mem['used'] - baseline
 
-                timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = datetime.now().strftime("%H:%M:%S")
 
-                telly_str = f"  Telly: {telly_mem}MB" if telly_mem else ""
+            telly_str = f"  Telly: {telly_mem}MB" if telly_mem else ""
 
-                # Color coding based on memory pressure
-                if mem['used'] > mem['total'] * 0.9:
-                    status = "CRITICAL"
-                elif mem['used'] > mem['total'] * 0.75:
-                    status = "HIGH"
-                else:
-                    status = "OK"
+            # Color coding based on memory pressure
+            if mem['used'] > mem['total'] * 0.9:
+                status = "CRITICAL"
+            elif mem['used'] > mem['total'] * 0.75:
+                status = "HIGH"
+            else:
+                status = "OK"
 
-                print(f"[{timestamp}] Used: {mem['used']:5}MB / {mem['total']}MB  "
-                      f"(+{delta:+5}MB from start)  Peak: {peak}MB  [{status}]{telly_str}")
+            write(_LINE.format(ts=timestamp, u=mem['used'], t=mem['total'], d=delta,
+                               p=peak, s=status, tm=telly_str))
 
-                samples.append({
-                    'time': time.time(),
-                    'used': mem['used'],
-                    'delta': delta
-                })
+            # Warn if memory is increasing steadily
+            if sample_count >= TREND_WINDOW:
+                recent = samples[np.arange(sample_count - TREND_WINDOW, sample_count) % MAX_SAMPLES]
+                # Compare neighbours directly; np.diff would wrap around on uint32
+                if np.all(recent[1:] >= recent[:-1]) and int(recent[-1]) - int(recent[0]) > 100:
+                    write(_TREND_WARNING)
 
-                # Warn if memory is increasing steadily
-                if len(samples) >= 10:
-                    recent = samples[-10:]
-                    if all(recent[i]['used'] <= recent[i+1]['used'] for i in range(len(recent)-1)):
-                        if recent[-1]['used'] - recent[0]['used'] > 100:
-                            print("  ^ WARNING: Memory usage steadily increasing!")
+            lines_printed += 1
+            if lines_printed % FLUSH_EVERY == 0:
+                sys.stdout.flush()
 
-            time.sleep(5)
+        if sampler.error:
+            print(f"Error querying GPU: {sampler.error}")
 
     except KeyboardInterrupt:
+        sys.stdout.flush()
         print("\n")
         print("=" * 60)
         print("Summary:")
@@ -110,8 +283,11 @@ def main():
         print(f"  Peak:     {peak}MB")
         if baseline:
             print(f"  Growth:   {peak - baseline}MB")
-        if samples:
-            print(f"  Samples:  {len(samples)}")
+        if sample_count:
+            print(f"  Samples:  {sample_count}")
+    finally:
+        sampler.stop()
+        sampler.join(timeout=1)
 
 if __name__ == '__main__':
     main()
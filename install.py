@@ -67,15 +67,16 @@ def install_application():
                    "progress_window.py", "processing_window.py", "settings_window.py",
                    "loading_window.py", "shortcuts.py", "volume_meter.py"]
     
+    # Plain byte copies: none of these need copy2's mode/timestamp/xattr syscalls
     for file in python_files:
-        if os.path.exists(file):
-            shutil.copy2(file, app_dir)
-        else:
+        try:
+            (app_dir / file).write_bytes(Path(file).read_bytes())
+        except FileNotFoundError:
             print(f"Warning: Could not find {file}")
     
     # Copy requirements.txt
     if os.path.exists('requirements.txt'):
-        shutil.copy2('requirements.txt', app_dir)
+        (app_dir / 'requirements.txt').write_bytes(Path('requirements.txt').read_bytes())
     
     # Create launcher script with proper Python path and input group handling
     launcher_path = bin_dir / app_name
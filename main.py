@@ -1,11 +1,15 @@
 import sys
 import os
+import re
+import glob
+import grp
+import ctypes
 import signal
 import atexit
 
-# Check if CUDA libraries need to be set up and re-exec if necessary
+# Preload CUDA libraries from the nvidia wheels so faster_whisper can find them
 def ensure_cuda_libs():
-    """Ensure NVIDIA cuDNN libraries are in LD_LIBRARY_PATH, re-exec if needed"""
+    """Load NVIDIA cuDNN/cuBLAS libraries into the process before faster_whisper imports"""
     try:
         import nvidia.cudnn
         import nvidia.cublas
@@ -17,24 +21,24 @@ def ensure_cuda_libs():
         if hasattr(nvidia.cublas, '__path__') and nvidia.cublas.__path__:
             cublas_lib = os.path.join(list(nvidia.cublas.__path__)[0], 'lib')
         
-        # Check if libraries are already in path
-        current_ld = os.environ.get('LD_LIBRARY_PATH', '')
-        needs_reexec = False
-        new_paths = []
-        
-        if cudnn_lib and os.path.exists(cudnn_lib) and cudnn_lib not in current_ld:
-            new_paths.append(cudnn_lib)
-            needs_reexec = True
-        if cublas_lib and os.path.exists(cublas_lib) and cublas_lib not in current_ld:
-            new_paths.append(cublas_lib)
-            needs_reexec = True
-        
-        # Re-exec with updated LD_LIBRARY_PATH if needed
-        if needs_reexec and not os.environ.get('_CUDA_LIBS_SET'):
-            new_ld = ':'.join(new_paths + ([current_ld] if current_ld else []))
-            os.environ['LD_LIBRARY_PATH'] = new_ld
-            os.environ['_CUDA_LIBS_SET'] = '1'
-            os.execv(sys.executable, [sys.executable] + sys.argv)
+        # Load with RTLD_GLOBAL so later dlopen() calls resolve against these
+        # instead of searching LD_LIBRARY_PATH (avoids re-exec'ing the interpreter)
+        pending = []
+        for libdir in (cudnn_lib, cublas_lib):
+            if libdir and os.path.isdir(libdir):
+                pending.extend(sorted(glob.glob(os.path.join(libdir, 'lib*.so*'))))
+
+        # Libraries can depend on each other, so retry failures until no progress
+        while pending:
+            failed = []
+            for so in pending:
+                try:
+                    ctypes.CDLL(so, mode=ctypes.RTLD_GLOBAL)
+                except OSError:
+                    failed.append(so)
+            if len(failed) == len(pending):
+                break
+            pending = failed
             
     except ImportError:
         pass  # nvidia packages not installed
@@ -48,13 +52,9 @@ import logging
 from settings_window import SettingsWindow
 from progress_window import ProgressWindow
 from processing_window import ProcessingWindow
-from recorder import AudioRecorder
-from transcriber import WhisperTranscriber
 from loading_window import LoadingWindow
 from PyQt6.QtCore import pyqtSignal
 import warnings
-import ctypes
-from shortcuts import GlobalShortcuts
 from settings import Settings
 
 # Setup logging
@@ -82,8 +82,16 @@ except (OSError, AttributeError) as e:
 def check_input_group_access():
     """Check if we have access to input devices for global shortcuts"""
     try:
-        # Check if we can access an input device
-        import glob
+        input_group = grp.getgrnam('input')
+    except KeyError:
+        input_group = None
+
+    if input_group is not None:
+        # Membership of this process (reflects `sg input` from the launcher)
+        return input_group.gr_gid == os.getgid() or input_group.gr_gid in os.getgroups()
+
+    # No input group on this system - check device permissions directly
+    try:
         input_devices = glob.glob('/dev/input/event*')
         if input_devices and os.access(input_devices[0], os.R_OK):
             return True
@@ -91,20 +99,28 @@ def check_input_group_access():
         pass
     return False
 
+# Matches the argv of other telly-spelly instances (same pattern pgrep -f used)
+_STALE_PROCESS_RE = re.compile(rb'python.*telly.*main\.py')
+
 def kill_stale_telly_processes():
     """Kill any stale telly-spelly processes that might be holding GPU memory"""
-    import subprocess
     current_pid = os.getpid()
     try:
-        # Find other telly-spelly python processes
-        result = subprocess.run(
-            ['pgrep', '-f', 'python.*telly.*main.py'],
-            capture_output=True, text=True
-        )
-        if result.stdout:
-            for pid_str in result.stdout.strip().split('\n'):
-                pid = int(pid_str)
-                if pid != current_pid:
+        # Scan /proc directly instead of forking pgrep
+        with os.scandir('/proc') as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                if pid == current_pid:
+                    continue
+                try:
+                    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                        # argv is NUL-separated; join with spaces like pgrep -f
+                        cmdline = f.read().replace(b'\0', b' ')
+                except OSError:
+                    continue
+                if _STALE_PROCESS_RE.search(cmdline):
                     logger.warning(f"Killing stale telly-spelly process: {pid}")
                     try:
                         os.kill(pid, signal.SIGTERM)
@@ -171,6 +187,7 @@ class TrayRecorder(QSystemTrayIcon):
         
         # Add shortcuts handler
         # Use QueuedConnection for thread-safe signal delivery from pynput thread
+        from shortcuts import GlobalShortcuts
         self.shortcuts = GlobalShortcuts()
         self.shortcuts.start_recording_triggered.connect(
             self.start_recording, Qt.ConnectionType.QueuedConnection)
@@ -263,7 +280,9 @@ class TrayRecorder(QSystemTrayIcon):
             # Show progress window
             if not self.progress_window:
                 self.progress_window = ProgressWindow("Voice Recording")
-                self.progress_window.stop_clicked.connect(self.stop_recording)
+                # Queued like the shortcut signals so stop always runs from the event loop
+                self.progress_window.stop_clicked.connect(
+                    self.stop_recording, Qt.ConnectionType.QueuedConnection)
             self.progress_window.show()
             
             # Start recording
@@ -271,18 +290,12 @@ class TrayRecorder(QSystemTrayIcon):
             self.setIcon(self.recording_icon)
             self.recorder.start_recording()
 
-    def stop_recording(self):
-        """Handle stopping the recording and starting processing"""
-        if not self.recording:
-            return
-        
-        logger.info("TrayRecorder: Stopping recording")
-        self.toggle_recording()  # This is now safe since toggle_recording handles everything
-
     def toggle_settings(self):
         if not self.settings_window:
             self.settings_window = SettingsWindow()
             self.settings_window.shortcuts_changed.connect(self.update_shortcuts)
+            if self.transcriber:
+                self.settings_window.settings_changed.connect(self.transcriber.reload_settings)
         
         if self.settings_window.isVisible():
             self.settings_window.hide()
@@ -475,13 +488,16 @@ def initialize_tray(tray, loading_window, app):
         tray.initialize()
         
         # Initialize recorder
+        # Heavy modules are imported here, after the loading window has painted
         loading_window.set_status("Initializing audio system...")
         app.processEvents()
+        from recorder import AudioRecorder
         tray.recorder = AudioRecorder()
         
         # Initialize transcriber
         loading_window.set_status("Loading Whisper model...")
         app.processEvents()
+        from transcriber import WhisperTranscriber
         tray.transcriber = WhisperTranscriber()
         
         # Connect signals
@@ -1,4 +1,4 @@
-from PyQt6.QtCore import QSettings
+from PyQt6.QtCore import QSettings, QTimer
 from pathlib import Path
 
 class Settings:
@@ -19,9 +19,19 @@ class Settings:
         'ru': 'Russian',
         # Add more languages as needed
     }
+    VALID_LANGUAGES_KEYS = frozenset(VALID_LANGUAGES)
+    VALID_MODELS_SET = frozenset(VALID_MODELS)
+    
+    # In-memory copy of all stored values, shared by every Settings instance
+    # so reads never hit QSettings and writes are visible process-wide
+    _cache = None
+    _sync_pending = False
     
     def __init__(self):
         self.settings = QSettings('TellySpelly', 'TellySpelly')
+        if Settings._cache is None:
+            Settings._cache = {key: self.settings.value(key) for key in self.settings.allKeys()}
+        self._cache = Settings._cache
     
     @staticmethod
     def get_config_dir() -> Path:
@@ -36,32 +46,44 @@ class Settings:
         return Settings.get_config_dir() / 'custom_words.json'
         
     def get(self, key, default=None):
-        value = self.settings.value(key, default)
+        value = self._cache.get(key, default)
         
         # Validate specific settings
-        if key == 'model' and value not in self.VALID_MODELS:
+        if key == 'model' and value not in self.VALID_MODELS_SET:
             return default
-        elif key == 'mic_index':
+        elif key in ('mic_index', 'batch_size', 'beam_size'):
             try:
                 return int(value)
             except (ValueError, TypeError):
                 return default
-        elif key == 'language' and value not in self.VALID_LANGUAGES:
+        elif key == 'language' and value not in self.VALID_LANGUAGES_KEYS:
             return 'auto'  # Default to auto-detect
                 
         return value
         
     def set(self, key, value):
         # Validate before saving
-        if key == 'model' and value not in self.VALID_MODELS:
+        if key == 'model' and value not in self.VALID_MODELS_SET:
             raise ValueError(f"Invalid model: {value}")
-        elif key == 'mic_index':
+        elif key in ('mic_index', 'batch_size', 'beam_size'):
             try:
                 value = int(value)
             except (ValueError, TypeError):
-                raise ValueError(f"Invalid mic_index: {value}")
-        elif key == 'language' and value not in self.VALID_LANGUAGES:
+                raise ValueError(f"Invalid {key}: {value}")
+        elif key == 'language' and value not in self.VALID_LANGUAGES_KEYS:
             raise ValueError(f"Invalid language: {value}")
                 
+        self._cache[key] = value
         self.settings.setValue(key, value)
+        self._schedule_sync()
+    
+    def _schedule_sync(self):
+        """Coalesce bursts of writes into a single sync to disk"""
+        if Settings._sync_pending:
+            return
+        Settings._sync_pending = True
+        QTimer.singleShot(500, self._sync)
+    
+    def _sync(self):
+        Settings._sync_pending = False
         self.settings.sync()
\ No newline at end of file
@@ -46,6 +46,7 @@ class ShortcutEdit(QLineEdit):
 class SettingsWindow(QWidget):
     initialization_complete = pyqtSignal()
     shortcuts_changed = pyqtSignal(str, str)  # start_key, stop_key
+    settings_changed = pyqtSignal()  # a transcription setting was saved
 
     def __init__(self):
         super().__init__()
@@ -141,6 +142,7 @@ class SettingsWindow(QWidget):
         language_code = self.lang_combo.currentData()
         try:
             self.settings.set('language', language_code)
+            self.settings_changed.emit()
         except ValueError as e:
             logger.error(f"Failed to set language: {e}")
             QMessageBox.warning(self, "Error", str(e))
@@ -158,6 +160,7 @@ class SettingsWindow(QWidget):
             
         try:
             self.settings.set('model', model_name)
+            self.settings_changed.emit()
         except ValueError as e:
             logger.error(f"Failed to set model: {e}")
             QMessageBox.warning(self, "Error", str(e))
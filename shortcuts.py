@@ -4,6 +4,35 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Hotkey part name -> pynput key: every special key by name (__members__ keeps
+# enum aliases like cmd_l), plus common aliases
+_HOTKEY_NAMES = dict(keyboard.Key.__members__)
+_HOTKEY_NAMES.update({
+    'ctrl': keyboard.Key.ctrl,
+    'control': keyboard.Key.ctrl,
+    'alt': keyboard.Key.alt,
+    'shift': keyboard.Key.shift,
+    'super': keyboard.Key.cmd,
+    'meta': keyboard.Key.cmd,
+    'win': keyboard.Key.cmd,
+    'cmd': keyboard.Key.cmd,
+})
+
+# Left/right modifier variants -> the generic key used in parsed hotkeys
+_NORMALIZE = {
+    'ctrl_l': keyboard.Key.ctrl,
+    'ctrl_r': keyboard.Key.ctrl,
+    'alt_l': keyboard.Key.alt,
+    'alt_r': keyboard.Key.alt,
+    'alt_gr': keyboard.Key.alt,
+    'shift_l': keyboard.Key.shift,
+    'shift_r': keyboard.Key.shift,
+    'cmd_l': keyboard.Key.cmd,
+    'cmd_r': keyboard.Key.cmd,
+    'super_l': keyboard.Key.cmd,
+    'super_r': keyboard.Key.cmd,
+}
+
 
 class GlobalShortcuts(QObject):
     start_recording_triggered = pyqtSignal()
@@ -14,29 +43,19 @@ class GlobalShortcuts(QObject):
         self._listener = None
         self._start_keys = set()
         self._stop_keys = set()
-        self._current_keys = set()
+        # Each key used by a hotkey gets one bit; pressed keys are tracked as a mask
+        self._key_bits = {}
+        self._start_mask = 0
+        self._stop_mask = 0
+        self._current_mask = 0
 
     def _parse_hotkey(self, hotkey_str):
         """Parse a hotkey string like 'ctrl+alt+r' into a set of pynput keys"""
         keys = set()
         for part in hotkey_str.lower().split('+'):
             part = part.strip()
-            if part in ('ctrl', 'control'):
-                keys.add(keyboard.Key.ctrl)
-            elif part == 'alt':
-                keys.add(keyboard.Key.alt)
-            elif part == 'shift':
-                keys.add(keyboard.Key.shift)
-            elif part in ('super', 'meta', 'win', 'cmd'):
-                keys.add(keyboard.Key.cmd)
-            elif len(part) == 1:
-                keys.add(keyboard.KeyCode.from_char(part))
-            else:
-                # Try to get special key
-                try:
-                    keys.add(getattr(keyboard.Key, part))
-                except AttributeError:
-                    keys.add(keyboard.KeyCode.from_char(part[0]))
+            key = _HOTKEY_NAMES.get(part)
+            keys.add(key if key is not None else keyboard.KeyCode.from_char(part[0]))
         return keys
 
     def setup_shortcuts(self, start_key='ctrl+alt+r', stop_key='ctrl+alt+s'):
@@ -47,6 +66,10 @@ class GlobalShortcuts(QObject):
             self._start_keys = self._parse_hotkey(start_key)
             self._stop_keys = self._parse_hotkey(stop_key)
 
+            self._key_bits = {key: 1 << i for i, key in enumerate(self._start_keys | self._stop_keys)}
+            self._start_mask = self._mask_for(self._start_keys)
+            self._stop_mask = self._mask_for(self._stop_keys)
+
             self._listener = keyboard.Listener(
                 on_press=self._on_press,
                 on_release=self._on_release
@@ -60,48 +83,49 @@ class GlobalShortcuts(QObject):
             logger.error(f"Failed to register global shortcuts: {e}")
             return False
 
+    def _mask_for(self, keys):
+        """Combine the bits of a set of keys into a single mask"""
+        mask = 0
+        for key in keys:
+            mask |= self._key_bits[key]
+        return mask
+
     def remove_shortcuts(self):
         """Remove existing shortcuts"""
         if self._listener:
             self._listener.stop()
             self._listener = None
-        self._current_keys.clear()
+        self._current_mask = 0
 
     def _normalize_key(self, key):
         """Normalize key for comparison (handle left/right variants)"""
-        if hasattr(key, 'name'):
-            name = key.name
-            if name in ('ctrl_l', 'ctrl_r'):
-                return keyboard.Key.ctrl
-            elif name in ('alt_l', 'alt_r', 'alt_gr'):
-                return keyboard.Key.alt
-            elif name in ('shift_l', 'shift_r'):
-                return keyboard.Key.shift
-            elif name in ('cmd_l', 'cmd_r', 'super_l', 'super_r'):
-                return keyboard.Key.cmd
-        return key
+        return _NORMALIZE.get(getattr(key, 'name', None), key)
 
     def _on_press(self, key):
         """Handle key press events"""
-        normalized = self._normalize_key(key)
-        self._current_keys.add(normalized)
+        bit = self._key_bits.get(self._normalize_key(key))
+        if not bit:
+            # Not part of any hotkey
+            return
+        self._current_mask |= bit
+        current = self._current_mask
 
         # Check if start hotkey is pressed
-        if self._start_keys and self._start_keys.issubset(self._current_keys):
+        if self._start_mask and (current & self._start_mask) == self._start_mask:
             logger.info("Start recording shortcut triggered")
             self.start_recording_triggered.emit()
 
         # Check if stop hotkey is pressed
-        if self._stop_keys and self._stop_keys.issubset(self._current_keys):
+        if self._stop_mask and (current & self._stop_mask) == self._stop_mask:
             logger.info("Stop recording shortcut triggered")
             self.stop_recording_triggered.emit()
 
     def _on_release(self, key):
         """Handle key release events"""
-        normalized = self._normalize_key(key)
-        self._current_keys.discard(normalized)
-        # Also discard the original key in case normalization differs
-        self._current_keys.discard(key)
+        bit = self._key_bits.get(self._normalize_key(key), 0)
+        # Also clear the original key in case normalization differs
+        bit |= self._key_bits.get(key, 0)
+        self._current_mask &= ~bit
 
     def __del__(self):
         self.remove_shortcuts()
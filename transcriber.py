@@ -1,35 +1,107 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer, Qt
-from faster_whisper import WhisperModel
+from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer, Qt, QRunnable, QThreadPool
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+import ctranslate2
+from faster_whisper.audio import decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+import numpy as np
+import atexit
+import io
 import os
+import sys
+import queue
 import logging
+import logging.handlers
 import json
 import re
 import time
 import gc
+import functools
+import collections
+import threading
+import wave
 from settings import Settings
 
+# orjson parses bytes straight into Python objects; fall back to the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _JSON_READ_MODE = 'rb'
+except ImportError:
+    _json_loads = json.loads
+    _JSON_READ_MODE = 'r'
+
+# pyahocorasick scans for many replacement keys at once; the regex covers small sets
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Whisper models expect 16 kHz mono input
+SAMPLE_RATE = 16000
+
+# Greedy segments below these confidence thresholds are re-decoded with beam search
+LOW_CONFIDENCE_LOGPROB = -1.0
+LOW_CONFIDENCE_NO_SPEECH_PROB = 0.6
+FALLBACK_BEAM_SIZE = 5
+
+# Silero VAD settings for short dictation clips, and the length below which
+# VAD is skipped because running it costs more than decoding the silence
+VAD_PARAMETERS = {"threshold": 0.5, "min_silence_duration_ms": 500, "speech_pad_ms": 200}
+SHORT_AUDIO_SECONDS = 5
+
+# Use an Aho-Corasick automaton instead of the regex above this many regex keys
+AHOCORASICK_MIN_KEYS = 16
+# The only non-ASCII characters re.IGNORECASE matches against ASCII letters
+# (İ ı ſ K); str.lower() doesn't fold them the same way, so text containing
+# them goes through the regex
+_IGNORECASE_ASCII_FOLDS = re.compile('[\u0130\u0131\u017f\u212a]')
+
+# ctranslate2 threading: how many transcriptions can run on the model at once
+# (one TranscriptionWorker per slot), and intra-op threads for each of them so
+# concurrent CPU decodes share the cores instead of oversubscribing them
+NUM_WORKERS = 2
+CPU_THREADS = max(1, (os.cpu_count() or 1) // NUM_WORKERS)
+
 # #region agent log
 def _get_debug_log_path():
     """Get debug log path in config directory"""
     config_dir = Settings.get_config_dir()
     return config_dir / "debug.log"
 
+# Entries go through a queue to a single FileHandler on a listener thread, so
+# callers (including the transcription worker) never open or write the file
+_debug_queue = queue.SimpleQueue()
+_debug_logger = logging.getLogger('telly-spelly.debug')
+# Off unless TELLY_SPELLY_DEBUG is set or the app logs at DEBUG level
+if os.environ.get('TELLY_SPELLY_DEBUG'):
+    _debug_logger.setLevel(logging.DEBUG)
+_debug_logger.propagate = False
+_debug_logger.addHandler(logging.handlers.QueueHandler(_debug_queue))
+_debug_listener = logging.handlers.QueueListener(
+    _debug_queue, logging.FileHandler(_get_debug_log_path(), delay=True))
+_debug_listener.start()
+atexit.register(_debug_listener.stop)
+
 def _debug_log(hypothesis_id, location, message, data=None):
-    import json as _json
-    try:
-        debug_path = _get_debug_log_path()
-        entry = {"hypothesisId": hypothesis_id, "location": location, "message": message, "data": data or {}, "timestamp": int(time.time() * 1000), "sessionId": "debug-session"}
-        with open(debug_path, "a") as f:
-            f.write(_json.dumps(entry) + "\n")
-    except OSError as e:
-        logger.debug(f"Could not write debug log: {e}")
+    if not _debug_logger.isEnabledFor(logging.DEBUG):
+        return
+    entry = {"hypothesisId": hypothesis_id, "location": location, "message": message, "data": data or {}, "timestamp": int(time.time() * 1000), "sessionId": "debug-session"}
+    _debug_logger.debug(json.dumps(entry))
 # #endregion
 
 
+# (st_mtime_ns, config) of the last successfully parsed custom words file
+_CUSTOM_CACHE = None
+
+
 def load_custom_words():
-    """Load custom words configuration from JSON file"""
+    """Load custom words configuration from JSON file
+
+    The parsed config is reused until the file's mtime changes.
+    """
+    global _CUSTOM_CACHE
     # #region agent log
     _t0 = time.time()
     # #endregion
@@ -41,17 +113,23 @@ def load_custom_words():
         "initial_prompt": ""
     }
     
-    if not custom_words_path.exists():
+    try:
+        mtime = custom_words_path.stat().st_mtime_ns
+    except FileNotFoundError:
         # #region agent log
         _debug_log("E", "load_custom_words", "no_config_file", {"exists": False, "load_time_ms": (time.time()-_t0)*1000})
         # #endregion
         return default_config
+
+    if _CUSTOM_CACHE is not None and _CUSTOM_CACHE[0] == mtime:
+        return _CUSTOM_CACHE[1]
     
     try:
-        with open(custom_words_path, 'r') as f:
-            config = json.load(f)
+        with open(custom_words_path, _JSON_READ_MODE) as f:
+            config = _json_loads(f.read())
             # Merge with defaults to ensure all keys exist
             result = {**default_config, **config}
+            _CUSTOM_CACHE = (mtime, result)
             # #region agent log
             _debug_log("E", "load_custom_words", "loaded_config", {"hotwords_len": len(result.get("hotwords","")), "replacements_count": len(result.get("replacements",{})), "initial_prompt_len": len(result.get("initial_prompt","")), "load_time_ms": (time.time()-_t0)*1000})
             # #endregion
@@ -61,16 +139,282 @@ def load_custom_words():
         return default_config
 
 
-def apply_replacements(text, replacements):
-    """Apply case-insensitive replacements to text"""
+def _overlaps(a, b):
+    """True if an occurrence of a and an occurrence of b could share characters"""
+    if a in b or b in a:
+        return True
+    return any(a.endswith(b[:i]) or b.endswith(a[:i]) for i in range(1, min(len(a), len(b))))
+
+
+@functools.lru_cache(maxsize=8)
+def _build_replacement_regex(items):
+    """Compile sorted (key, replacement) pairs; cached so reloads reuse the pattern"""
+    lowered = [key.lower() for key, _ in items if key]
+
+    def is_plain(key, value):
+        # A key without cased characters matches the same with or without
+        # IGNORECASE. It can skip the regex for str.replace only if its matches
+        # and its output can't touch any other key's, so the result is the same
+        # as the single leftmost-longest pass.
+        key_lower, value_lower = key.lower(), value.lower()
+        return (key_lower == key.upper() and value_lower
+                and not any(_overlaps(key_lower, other) for other in lowered if other != key_lower)
+                and not any(_overlaps(value_lower, other) for other in lowered))
+
+    plain = tuple(sorted(((key, value) for key, value in items if key and is_plain(key, value)),
+                         key=lambda pair: len(pair[0]), reverse=True))
+    plain_keys = {key for key, _ in plain}
+    keys = sorted((key for key, _ in items if key and key not in plain_keys),
+                  key=len, reverse=True)
+    if not keys:
+        return None, (), plain
+
+    replacements = dict(items)
+    repls = tuple(replacements[key] for key in keys)
+
+    # One capture group per key: m.lastindex identifies the alternative that
+    # matched, so no lowercasing or dict lookup is needed per match
+    pattern = re.compile("|".join(f"({re.escape(key)})" for key in keys), re.IGNORECASE)
+
+    # For ASCII keys, str.lower() folds exactly like IGNORECASE on any text
+    # without the characters in _IGNORECASE_ASCII_FOLDS
+    if (ahocorasick is not None and len(keys) > AHOCORASICK_MIN_KEYS
+            and all(key.isascii() for key in keys)):
+        automaton = ahocorasick.Automaton()
+        for key in keys:
+            # Keys differing only in case: keep the first, as the regex would
+            if not automaton.exists(key.lower()):
+                automaton.add_word(key.lower(), (len(key), replacements[key]))
+        automaton.make_automaton()
+        return (automaton, pattern), repls, plain
+
+    return pattern, repls, plain
+
+
+def build_replacement_regex(replacements):
+    """Compile replacements into one case-insensitive alternation pattern
+
+    Returns (pattern, repls, plain): repls[i] replaces capture group i + 1,
+    and longer keys are tried first so they win over their prefixes. plain
+    holds caseless (key, replacement) pairs applied with str.replace before
+    the pattern runs; only keys that can't interact with any other key go
+    there, so longer keys still win. With pyahocorasick installed and more
+    than AHOCORASICK_MIN_KEYS regex keys, all ASCII, pattern is an
+    (automaton, regex) pair: the automaton over the lowercased keys gives
+    the same leftmost-longest result, and the regex handles text the
+    automaton can't fold identically.
+    """
     if not replacements:
+        return None, (), ()
+    return _build_replacement_regex(tuple(sorted(replacements.items())))
+
+
+def apply_replacements(text, pattern, repls, plain=()):
+    """Apply case-insensitive replacements to text"""
+    for key, value in plain:
+        text = text.replace(key, value)
+
+    if pattern is None:
         return text
-    
-    for pattern, replacement in replacements.items():
-        # Case-insensitive replacement
-        text = re.sub(re.escape(pattern), replacement, text, flags=re.IGNORECASE)
-    
-    return text
+    if isinstance(pattern, tuple):
+        automaton, pattern = pattern
+        if text.isascii() or not _IGNORECASE_ASCII_FOLDS.search(text):
+            return _apply_automaton(text, automaton)
+
+    return pattern.sub(lambda m: repls[m.lastindex - 1], text)
+
+
+def _apply_automaton(text, automaton):
+    """Replace leftmost-longest, non-overlapping automaton matches in text"""
+    # Same length as text: U+0130, the only character that lowercases to
+    # two, is routed to the regex by apply_replacements
+    lowered = text.lower()
+    matches = sorted((end - length + 1, -length, value)
+                     for end, (length, value) in automaton.iter(lowered))
+    parts = []
+    pos = 0
+    for start, neg_length, value in matches:
+        if start < pos:
+            continue
+        parts.append(text[pos:start])
+        parts.append(value)
+        pos = start - neg_length
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+# Compute types to try per device, fastest first; later entries are fallbacks
+_COMPUTE_TYPE_FALLBACKS = {
+    'cuda': ['int8_float16', 'float16', 'float32'],
+    'cpu': ['int8', 'float32'],
+}
+
+
+def detect_device():
+    """Use CUDA when ctranslate2 can see a GPU, otherwise the CPU"""
+    try:
+        if ctranslate2.get_cuda_device_count() > 0:
+            return 'cuda'
+    except RuntimeError:
+        pass
+    return 'cpu'
+
+
+def default_compute_type(device):
+    """Pick the fastest compute type ctranslate2 supports on device
+
+    int8_float16 uses INT8 tensor cores (Turing+) with FP16 activations and
+    int8 on the CPU uses VNNI where available (Cascade Lake+). These are
+    ctranslate2's own int8 GEMM kernels, and it only reports a type as
+    supported where they exist.
+    """
+    candidates = _COMPUTE_TYPE_FALLBACKS.get(device, ['default'])
+    try:
+        supported = ctranslate2.get_supported_compute_types(device)
+    except (RuntimeError, ValueError):
+        return candidates[0]
+    for compute_type in candidates:
+        if compute_type in supported:
+            return compute_type
+    return candidates[-1]
+
+
+def _enable_tf32():
+    """Route any FP32 torch matmuls through TF32 tensor cores
+
+    faster-whisper itself doesn't use torch (ctranslate2 + ONNX VAD), so only
+    configure it if something else has already imported it rather than paying
+    torch's import cost here.
+    """
+    torch = sys.modules.get('torch')
+    if torch is None:
+        return
+    torch.set_float32_matmul_precision('high')
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+
+
+def create_whisper_model(model_name, device='auto', compute_type=None):
+    """Construct a WhisperModel, downgrading compute_type if it is unsupported
+
+    device='auto' probes for CUDA and falls back to the CPU if the GPU model
+    can't be created; compute_type=None picks the fastest supported type.
+    """
+    autodetect = device == 'auto'
+    if autodetect:
+        device = detect_device()
+    if not compute_type:
+        compute_type = default_compute_type(device)
+
+    if device == 'cuda':
+        _enable_tf32()
+
+    chain = _COMPUTE_TYPE_FALLBACKS.get(device, [])
+    if compute_type in chain:
+        candidates = chain[chain.index(compute_type):]
+    else:
+        candidates = [compute_type] + chain
+
+    last_error = None
+    for candidate in candidates:
+        try:
+            model = WhisperModel(model_name, device=device, compute_type=candidate,
+                                 cpu_threads=CPU_THREADS, num_workers=NUM_WORKERS)
+            logger.info(f"Created {model_name} model on {device} ({candidate})")
+            return model
+        except ValueError as e:
+            logger.warning(f"compute_type {candidate} not usable on {device}: {e}")
+            last_error = e
+        except RuntimeError as e:
+            # CUDA itself is unusable (driver, missing libs); no compute type will help
+            last_error = e
+            break
+
+    if autodetect and device == 'cuda':
+        logger.warning(f"Could not load model on CUDA, falling back to CPU: {last_error}")
+        return create_whisper_model(model_name, 'cpu')
+    raise last_error
+
+
+def _load_audio(path):
+    """Load a recording as 16 kHz mono float32
+
+    The recorder always writes 16 kHz mono 16-bit PCM WAV, which is read
+    straight into numpy. Anything else goes through faster-whisper's decoder
+    to be resampled.
+    """
+    try:
+        with wave.open(path, 'rb') as wf:
+            if (wf.getframerate() == SAMPLE_RATE and wf.getnchannels() == 1
+                    and wf.getsampwidth() == 2 and wf.getcomptype() == 'NONE'):
+                frames = wf.readframes(wf.getnframes())
+                return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    except (wave.Error, EOFError):
+        pass
+    return decode_audio(path, sampling_rate=SAMPLE_RATE)
+
+
+# Process-wide model cache keyed by the requested (model_name, device, compute_type)
+_MODEL_CACHE = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def get_whisper_model(model_name, device='auto', compute_type=None):
+    """Return the cached model for these settings, creating it on first use"""
+    key = (model_name, device, compute_type)
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = _MODEL_CACHE[key] = create_whisper_model(model_name, device, compute_type)
+        return model
+
+
+def release_whisper_model(model):
+    """Drop model from the cache so it is freed once the caller lets go of it"""
+    with _MODEL_CACHE_LOCK:
+        for key in [key for key, cached in _MODEL_CACHE.items() if cached is model]:
+            del _MODEL_CACHE[key]
+
+
+def _clip_windows(speech_chunks, max_seconds=30):
+    """Group VAD chunks into <=30 s windows over their concatenated audio
+
+    Windows break on chunk boundaries (silence) where possible, which is what
+    BatchedInferencePipeline expects as clip_timestamps (in seconds).
+    """
+    max_samples = max_seconds * SAMPLE_RATE
+    windows = []
+    window_start = window_end = 0
+    for chunk in speech_chunks:
+        length = chunk['end'] - chunk['start']
+        if window_end - window_start + length > max_samples and window_end > window_start:
+            windows.append((window_start, window_end))
+            window_start = window_end
+        window_end += length
+        # A single chunk longer than the window has to be split
+        while window_end - window_start > max_samples:
+            windows.append((window_start, window_start + max_samples))
+            window_start += max_samples
+    if window_end > window_start:
+        windows.append((window_start, window_end))
+    return [{'start': start / SAMPLE_RATE, 'end': end / SAMPLE_RATE} for start, end in windows]
+
+
+class _CleanupTask(QRunnable):
+    """Fire-and-forget removal of a finished recording"""
+
+    def __init__(self, audio_file):
+        super().__init__()
+        self.audio_file = audio_file
+
+    def run(self):
+        # Clean up audio file
+        try:
+            os.unlink(self.audio_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to remove temporary file: {e}")
 
 
 class TranscriptionWorker(QThread):
@@ -79,64 +423,113 @@ class TranscriptionWorker(QThread):
     error = pyqtSignal(str)
     oom_error = pyqtSignal()  # Emitted on CUDA OOM to trigger model reload
 
-    def __init__(self, model, audio_file, language='en', custom_words=None):
+    def __init__(self, model, audio_files, language='en', transcribe_kwargs=None,
+                 replacements=None, pipeline=None, batch_size=8):
         super().__init__()
         self.model = model
-        self.audio_file = audio_file
+        # BatchedInferencePipeline over model; None decodes windows one at a time
+        self.pipeline = pipeline
+        self.batch_size = batch_size
+        self.audio_files = list(audio_files)
         self.language = language
-        self.custom_words = custom_words or {}
+        # Shared template built from custom words; copied, never mutated
+        self.transcribe_kwargs = transcribe_kwargs or {}
+        # (pattern, repls, plain) from build_replacement_regex
+        self.replacements = replacements or (None, (), ())
+
+    @staticmethod
+    def _is_low_confidence(segment):
+        return (segment.avg_logprob < LOW_CONFIDENCE_LOGPROB
+                or segment.no_speech_prob > LOW_CONFIDENCE_NO_SPEECH_PROB)
+
+    def _redecode_segment(self, audio, segment, language, transcribe_kwargs):
+        """Re-transcribe one segment's audio with beam search"""
+        start = max(0, int(segment.start * SAMPLE_RATE))
+        end = min(len(audio), int(segment.end * SAMPLE_RATE))
+        if end <= start:
+            return segment.text.strip()
+
+        retry_kwargs = {
+            **transcribe_kwargs,
+            "language": language,
+            "beam_size": FALLBACK_BEAM_SIZE,
+            "vad_filter": False,  # already a speech span
+            "without_timestamps": True,
+        }
+        retry_segments, _ = self.model.transcribe(audio[start:end], **retry_kwargs)
+        return " ".join(filter(None, (s.text.strip() for s in retry_segments)))
 
     def run(self):
+        for audio_file in self.audio_files:
+            self._transcribe_one(audio_file)
+
+    def _transcribe_one(self, audio_file):
         try:
-            if not os.path.exists(self.audio_file):
-                raise FileNotFoundError(f"Audio file not found: {self.audio_file}")
+            if not os.path.exists(audio_file):
+                raise FileNotFoundError(f"Audio file not found: {audio_file}")
 
             self.progress.emit("Loading audio file...")
             self.progress.emit("Processing audio with Whisper...")
 
-            # Build transcribe kwargs with custom words support
+            # Only the per-call fields are patched onto the prebuilt template
             transcribe_kwargs = {
+                **self.transcribe_kwargs,
                 "language": None if self.language == 'auto' else self.language,
-                "beam_size": 1,  # Changed from 5 to 1 for faster greedy decoding
-                "vad_filter": True  # Filters out silence for faster processing
+                "vad_filter": False  # VAD already applied to the decoded audio below
             }
-            
-            # Add hotwords if configured
-            hotwords = self.custom_words.get('hotwords', '')
-            if hotwords:
-                transcribe_kwargs['hotwords'] = hotwords
-                logger.debug(f"Using hotwords: {hotwords[:50]}...")
-            
-            # Add initial prompt if configured
-            initial_prompt = self.custom_words.get('initial_prompt', '')
-            if initial_prompt:
-                transcribe_kwargs['initial_prompt'] = initial_prompt
-                logger.debug(f"Using initial prompt: {initial_prompt[:50]}...")
+
+            # Load once as 16 kHz mono float32 and hand the array to the model
+            audio = _load_audio(audio_file)
+
+            # Run Silero VAD once ourselves and only transcribe the voiced chunks.
+            # Segment timestamps (used for re-decoding) are relative to this array.
+            if len(audio) < SHORT_AUDIO_SECONDS * SAMPLE_RATE:
+                speech_chunks = [{'start': 0, 'end': len(audio)}]
+            else:
+                speech_chunks = get_speech_timestamps(audio, VadOptions(**VAD_PARAMETERS))
+            if not speech_chunks:
+                raise ValueError("No text was transcribed")
+            voiced = np.concatenate([audio[chunk['start']:chunk['end']] for chunk in speech_chunks])
 
             # #region agent log
-            import wave as _wave
-            try:
-                with _wave.open(self.audio_file, 'rb') as wf:
-                    _audio_duration = wf.getnframes() / wf.getframerate()
-                    _audio_size = os.path.getsize(self.audio_file)
-            except (OSError, _wave.Error) as e:
-                logger.debug(f"Could not read audio file for debug logging: {e}")
-                _audio_duration, _audio_size = -1, -1
-            _debug_log("F,G,H,I", "TranscriptionWorker.run", "before_transcribe", {"has_hotwords": bool(hotwords), "hotwords_len": len(hotwords), "has_initial_prompt": bool(initial_prompt), "initial_prompt_len": len(initial_prompt), "audio_duration_sec": _audio_duration, "audio_size_bytes": _audio_size, "beam_size": transcribe_kwargs.get("beam_size")})
+            if _debug_logger.isEnabledFor(logging.DEBUG):
+                hotwords = transcribe_kwargs.get('hotwords', '')
+                initial_prompt = transcribe_kwargs.get('initial_prompt', '')
+                _debug_log("F,G,H,I", "TranscriptionWorker.run", "before_transcribe", {"has_hotwords": bool(hotwords), "hotwords_len": len(hotwords), "has_initial_prompt": bool(initial_prompt), "initial_prompt_len": len(initial_prompt), "beam_size": transcribe_kwargs.get("beam_size")})
             _t_transcribe_start = time.time()
             # #endregion
             # faster-whisper returns (segments, info)
-            segments, info = self.model.transcribe(self.audio_file, **transcribe_kwargs)
+            if self.pipeline is not None:
+                # Batch the <=30 s voiced windows through the encoder/decoder together
+                segments, info = self.pipeline.transcribe(
+                    voiced, batch_size=self.batch_size,
+                    clip_timestamps=_clip_windows(speech_chunks), **transcribe_kwargs)
+            else:
+                segments, info = self.model.transcribe(voiced, **transcribe_kwargs)
 
             # #region agent log
             _t_segments_start = time.time()
             # #endregion
-            # Collect all segments into text
-            text = " ".join([segment.text.strip() for segment in segments])
-            # Explicitly delete segments to free GPU memory
-            del segments
-            del info
+            # Collect segments as they decode, reporting how far decoding has got
+            buf = io.StringIO()
+            # Retrying with beam search only helps if the first pass used a narrower beam
+            redecode = transcribe_kwargs.get('beam_size', 1) < FALLBACK_BEAM_SIZE
+            for segment in segments:
+                if redecode and self._is_low_confidence(segment):
+                    # Greedy result looks unreliable; retry just this span with beam search
+                    segment_text = self._redecode_segment(voiced, segment, info.language, transcribe_kwargs)
+                else:
+                    segment_text = segment.text.strip()
+                # Silence-only segments strip to '' and would leave double spaces
+                if segment_text:
+                    buf.write(segment_text)
+                    buf.write(' ')
+                self.progress.emit(f"Transcribing... {segment.end:.1f}s")
+            text = buf.getvalue().rstrip()
             # #region agent log
+            # Durations come from the decoded array and info; no extra pass over the file
+            if _debug_logger.isEnabledFor(logging.DEBUG):
+                _debug_log("F,G,H,I", "TranscriptionWorker.run", "audio_durations", {"audio_duration_sec": len(audio) / SAMPLE_RATE, "info_duration_sec": info.duration, "duration_after_vad_sec": info.duration_after_vad, "audio_size_bytes": os.path.getsize(audio_file)})
             _t_segments_end = time.time()
             _debug_log("A,B,C", "TranscriptionWorker.run", "after_transcribe_and_segments", {"transcribe_call_time_ms": (_t_segments_start - _t_transcribe_start)*1000, "segments_collect_time_ms": (_t_segments_end - _t_segments_start)*1000, "text_len": len(text)})
             # #endregion
@@ -145,15 +538,14 @@ class TranscriptionWorker(QThread):
                 raise ValueError("No text was transcribed")
             
             # Apply post-processing replacements
-            replacements = self.custom_words.get('replacements', {})
             # #region agent log
             _t_replace_start = time.time()
             # #endregion
-            if replacements:
-                text = apply_replacements(text, replacements)
+            if self.replacements[0] is not None or self.replacements[2]:
+                text = apply_replacements(text, *self.replacements)
                 logger.debug("Applied custom word replacements")
             # #region agent log
-            _debug_log("D", "TranscriptionWorker.run", "after_replacements", {"replacements_count": len(replacements), "replace_time_ms": (time.time() - _t_replace_start)*1000})
+            _debug_log("D", "TranscriptionWorker.run", "after_replacements", {"replacements_count": len(self.replacements[1]) + len(self.replacements[2]), "replace_time_ms": (time.time() - _t_replace_start)*1000})
             # #endregion
 
             self.progress.emit("Transcription completed!")
@@ -172,42 +564,69 @@ class TranscriptionWorker(QThread):
                 self.error.emit(f"Transcription failed: {str(e)}")
             self.finished.emit("")
         finally:
-            # Clean up audio file
-            try:
-                if os.path.exists(self.audio_file):
-                    os.remove(self.audio_file)
-            except Exception as e:
-                logger.error(f"Failed to remove temporary file: {e}")
+            # finished has already been emitted; clean up off the worker's critical path
+            QThreadPool.globalInstance().start(_CleanupTask(audio_file))
+
+
+class _ModelLoader(QThread):
+    """Loads a WhisperModel off the UI thread"""
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
 
-            # Free GPU memory after transcription
-            # Force garbage collection to release segment references
-            gc.collect()
+    def __init__(self, model_name, device, compute_type):
+        super().__init__()
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
 
-            # Note: ctranslate2 doesn't expose a cache clearing API
-            # The memory is managed by ctranslate2's internal allocator
-            # torch.cuda.empty_cache() won't help here since ctranslate2 uses
-            # its own CUDA allocator, not PyTorch's
+    def run(self):
+        try:
+            model = get_whisper_model(self.model_name, self.device, self.compute_type)
+            self.loaded.emit(model)
+        except Exception as e:
+            logger.error(f"Failed to load Whisper model: {e}")
+            self.failed.emit(str(e))
 
 
 class WhisperTranscriber(QObject):
     transcription_progress = pyqtSignal(str)
     transcription_finished = pyqtSignal(str)
     transcription_error = pyqtSignal(str)
+    model_ready = pyqtSignal()
 
-    # Reload model after this many transcriptions to prevent memory fragmentation
-    MODEL_RELOAD_INTERVAL = 10
+    # How long to wait for more recordings before starting a batch
+    BATCH_WINDOW_MS = 100
 
     def __init__(self):
         super().__init__()
         self.model = None
-        self.worker = None
+        self.pipeline = None
+        # Running (and finished but not yet cleaned up) TranscriptionWorkers
+        self._workers = collections.deque()
+        # Values used on every transcription are snapshotted here and refreshed
+        # by reload_settings when the settings window saves a change
+        self._settings = Settings()
+        # (model_name, device, compute_type) of the current or in-flight model
+        self._model_key = None
         self.custom_words = {}
-        self._transcription_count = 0
+        self._hotwords = ''
+        self._initial_prompt = ''
+        self._transcribe_kwargs_template = {}
+        self.reload_settings()
+        self._replacements = (None, (), ())
+        # Set after a CUDA OOM so the next batch gets a fresh model
+        self._reload_pending = False
+        self._loader = None
+        # Error from the last failed model load; the next recording retries it
+        self._load_error = None
+        # Recordings waiting for the model or for the current worker
+        self._pending_files = []
+        self._flush_scheduled = False
         self._cleanup_timer = QTimer()
         self._cleanup_timer.timeout.connect(self._cleanup_worker)
         self._cleanup_timer.setSingleShot(True)
         self.load_custom_words()
-        self.load_model()
+        self.load_model_async()
 
     def _schedule_worker_cleanup(self):
         """Schedule worker cleanup (called when worker finishes)"""
@@ -218,16 +637,21 @@ class WhisperTranscriber(QObject):
         logger.info("Cleaning up transcriber and releasing GPU memory...")
 
         # Wait for any running worker to finish
-        if self.worker and self.worker.isRunning():
-            self.worker.wait(5000)  # Wait up to 5 seconds
-            self.worker = None
-
-        # Delete the model explicitly - this is the main GPU memory holder
+        for worker in self._workers:
+            if worker.isRunning():
+                worker.wait(5000)  # Wait up to 5 seconds
+        self._workers.clear()
+
+        # Let an in-flight model load finish so its model can be released too
+        if self._loader:
+            self._loader.wait()
+            self._loader = None
+
+        # Drop our reference to the shared cached model; it is freed once
+        # the last holder lets go
+        self.pipeline = None
         if self.model is not None:
-            # Clear the model's internal references
-            if hasattr(self.model, 'model'):
-                del self.model.model
-            del self.model
+            release_whisper_model(self.model)
             self.model = None
 
         # Force garbage collection to release all Python references
@@ -236,109 +660,179 @@ class WhisperTranscriber(QObject):
         # Note: ctranslate2 doesn't expose a cache clearing API
         # Memory is released when the model object is deleted
 
-        self._transcription_count = 0
+        self._reload_pending = False
         logger.info("Transcriber cleanup complete")
 
     def reload_model(self):
-        """Reload the model to free any accumulated GPU memory"""
-        # Safety check: don't reload while worker is using the model
-        if self.worker and self.worker.isRunning():
+        """Replace the model with a fresh one (after an OOM or a model settings change)"""
+        # Safety check: don't reload while a worker is using the model
+        if self._running_workers():
             logger.warning("Cannot reload model while transcription is in progress")
             return
 
-        logger.info(f"Reloading model after {self._transcription_count} transcriptions...")
+        logger.info("Reloading model...")
+        self.transcription_progress.emit("Reloading Whisper model...")
 
         # Clean up the old model
+        self.pipeline = None
         if self.model is not None:
-            if hasattr(self.model, 'model'):
-                del self.model.model
-            del self.model
+            release_whisper_model(self.model)
             self.model = None
 
-        gc.collect()
+        # Young generations are enough to drop cycles left by the old model
+        gc.collect(generation=1)
 
-        # Load fresh model
-        self.load_model()
-        self._transcription_count = 0
-        logger.info("Model reloaded successfully")
+        # Load the fresh model off the UI thread; _on_model_loaded drains the queue
+        self._reload_pending = False
+        self.load_model_async()
 
     def load_custom_words(self):
         """Load custom words configuration"""
         self.custom_words = load_custom_words()
-        if self.custom_words.get('hotwords'):
-            logger.info(f"Loaded {len(self.custom_words['hotwords'].split())} hotwords")
+        self._hotwords = self.custom_words.get('hotwords') or ''
+        self._initial_prompt = self.custom_words.get('initial_prompt') or ''
+        self._replacements = build_replacement_regex(self.custom_words.get('replacements'))
+        self._build_transcribe_kwargs()
+
+        if self._hotwords:
+            logger.info(f"Loaded {len(self._hotwords.split())} hotwords")
         if self.custom_words.get('replacements'):
             logger.info(f"Loaded {len(self.custom_words['replacements'])} replacements")
 
-    def load_model(self):
-        try:
-            settings = Settings()
-            model_name = settings.get('model', 'base')
-            device = settings.get('device', 'cuda')
-            compute_type = settings.get('compute_type', 'float16')
-            
-            # #region agent log
-            _debug_log("F,G,H", "load_model", "model_settings", {"model_name": model_name, "device": device, "compute_type": compute_type})
-            # #endregion
-            
-            logger.info(f"Loading faster-whisper model: {model_name} on {device} ({compute_type})")
+    def _build_transcribe_kwargs(self):
+        """Freeze the transcribe kwargs that only change with settings or custom words"""
+        self._transcribe_kwargs_template = {
+            "beam_size": self._beam_size,  # 1 (greedy) unless the beam_size setting raises it
+            "best_of": 1,
+            # A single temperature disables faster-whisper's fallback loop, which
+            # could re-decode a hard segment at up to five more temperatures;
+            # low-confidence segments get one beam-search retry in the worker instead
+            "temperature": 0.0,
+            "no_speech_threshold": 0.6,
+            "vad_filter": True,  # Filters out silence for faster processing
+            "vad_parameters": VAD_PARAMETERS,
+        }
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if self._hotwords:
+            self._transcribe_kwargs_template['hotwords'] = self._hotwords
+            if debug:
+                logger.debug(f"Using hotwords: {self._hotwords[:50]}...")
+        if self._initial_prompt:
+            self._transcribe_kwargs_template['initial_prompt'] = self._initial_prompt
+            if debug:
+                logger.debug(f"Using initial prompt: {self._initial_prompt[:50]}...")
+
+    def reload_settings(self):
+        """Re-read the per-transcription settings; connected to settings changes"""
+        self._language = self._settings.get('language', 'auto')
+        self._batch_size = self._settings.get('batch_size', 8)
+        self._beam_size = self._settings.get('beam_size', 1)
+        self._build_transcribe_kwargs()
+
+        # A different model/device/compute type is swapped in through the same
+        # path as an OOM reload, once the running workers are done
+        if self._model_key is not None and self._model_settings() != self._model_key:
+            logger.info("Model settings changed, will reload model on next transcription")
+            self._reload_pending = True
+
+    def _model_settings(self):
+        """Read (model_name, device, compute_type) from settings"""
+        model_name = self._settings.get('model', 'base')
+        device = self._settings.get('device', 'auto')
+        # None lets create_whisper_model pick the fastest type for the device
+        compute_type = self._settings.get('compute_type')
+        
+        return model_name, device, compute_type
+
+    def load_model_async(self):
+        """Load the model on a background thread; emits model_ready when done"""
+        if self._loader:
+            return
+        model_name, device, compute_type = self._model_key = self._model_settings()
 
-            self.model = WhisperModel(
-                model_name,
-                device=device,
-                compute_type=compute_type,
-            )
-            logger.info("Model loaded successfully")
+        # #region agent log
+        _debug_log("F,G,H", "load_model", "model_settings", {"model_name": model_name, "device": device, "compute_type": compute_type})
+        # #endregion
 
-        except Exception as e:
-            logger.error(f"Failed to load Whisper model: {e}")
-            raise
+        logger.info(f"Loading faster-whisper model: {model_name} on {device} ({compute_type or 'auto'})")
+        self._loader = _ModelLoader(model_name, device, compute_type)
+        self._loader.loaded.connect(self._on_model_loaded, Qt.ConnectionType.QueuedConnection)
+        self._loader.failed.connect(self._on_model_load_failed, Qt.ConnectionType.QueuedConnection)
+        self._loader.start()
+
+    def _on_model_loaded(self, model):
+        self.model = model
+        self.pipeline = BatchedInferencePipeline(model=model)
+        self._load_error = None
+        self._finish_loader()
+        logger.info("Model loaded successfully")
+        self.model_ready.emit()
+        self._flush_pending()
+
+    def _on_model_load_failed(self, error):
+        self._load_error = error
+        self._finish_loader()
+        for audio_file in self._pending_files:
+            QThreadPool.globalInstance().start(_CleanupTask(audio_file))
+        self._pending_files.clear()
+        self.transcription_error.emit(f"Failed to load Whisper model: {error}")
+
+    def _finish_loader(self):
+        if self._loader:
+            self._loader.wait()
+            self._loader.deleteLater()
+            self._loader = None
+
+    def _running_workers(self):
+        return sum(1 for worker in self._workers if worker.isRunning())
 
     def _cleanup_worker(self):
-        if self.worker:
-            if self.worker.isFinished():
-                self.worker.deleteLater()
-                self.worker = None
+        for _ in range(len(self._workers)):
+            worker = self._workers.popleft()
+            if worker.isFinished():
+                worker.deleteLater()
+            else:
+                self._workers.append(worker)
+        self._flush_pending()
 
     def transcribe(self, audio_file):
         """Transcribe audio file using faster-whisper"""
         try:
-            settings = Settings()
-            language = settings.get('language', 'auto')
+            if self.model is None:
+                raise RuntimeError("Whisper model is still loading")
+
+            language = self._language
 
             self.transcription_progress.emit("Processing audio...")
 
-            # Build transcribe kwargs with custom words support
             transcribe_kwargs = {
+                **self._transcribe_kwargs_template,
                 "language": None if language == 'auto' else language,
-                "beam_size": 1,  # Changed from 5 to 1 for faster greedy decoding
-                "vad_filter": True
             }
-            
-            # Add hotwords if configured
-            hotwords = self.custom_words.get('hotwords', '')
-            if hotwords:
-                transcribe_kwargs['hotwords'] = hotwords
-            
-            # Add initial prompt if configured
-            initial_prompt = self.custom_words.get('initial_prompt', '')
-            if initial_prompt:
-                transcribe_kwargs['initial_prompt'] = initial_prompt
 
-            segments, info = self.model.transcribe(audio_file, **transcribe_kwargs)
+            audio = _load_audio(audio_file)
+            if len(audio) < SHORT_AUDIO_SECONDS * SAMPLE_RATE:
+                # Too short for VAD to pay off; decode the clip whole
+                transcribe_kwargs["vad_filter"] = False
+                transcribe_kwargs["clip_timestamps"] = [{'start': 0, 'end': len(audio) / SAMPLE_RATE}]
+
+            segments, info = self.pipeline.transcribe(
+                audio, batch_size=self._batch_size, **transcribe_kwargs)
 
-            text = " ".join([segment.text.strip() for segment in segments])
-            # Explicitly delete to free GPU memory
-            del segments
-            del info
+            buf = io.StringIO()
+            for segment in segments:
+                segment_text = segment.text.strip()
+                if segment_text:
+                    buf.write(segment_text)
+                    buf.write(' ')
+                self.transcription_progress.emit(f"Transcribing... {segment.end:.1f}s")
+            text = buf.getvalue().rstrip()
 
             if not text:
                 raise ValueError("No text was transcribed")
             
             # Apply post-processing replacements
-            replacements = self.custom_words.get('replacements', {})
-            if replacements:
-                text = apply_replacements(text, replacements)
+            text = apply_replacements(text, *self._replacements)
 
             self.transcription_progress.emit("Transcription completed!")
             logger.info(f"Transcribed text: {text[:100]}...")
@@ -350,45 +844,72 @@ class WhisperTranscriber(QObject):
         finally:
             # Clean up audio file
             try:
-                if os.path.exists(audio_file):
-                    os.remove(audio_file)
-            except OSError:
+                os.unlink(audio_file)
+            except FileNotFoundError:
                 pass
-            # Free GPU memory
-            gc.collect()
-            # Note: torch.cuda.empty_cache() is ineffective for ctranslate2
-            # since ctranslate2 uses its own CUDA allocator
+            except OSError as e:
+                logger.error(f"Failed to remove temporary file: {e}")
 
     def transcribe_file(self, audio_file):
-        if self.worker and self.worker.isRunning():
-            logger.warning("Transcription already in progress")
+        """Queue a recording; recordings arriving close together are transcribed as a batch"""
+        self._pending_files.append(audio_file)
+        if self.model is None:
+            if self._loader is None and self._load_error is not None:
+                # Nothing is loading any more; retry so the recording isn't stranded
+                logger.warning(f"Retrying model load after failure: {self._load_error}")
+                self.load_model_async()
+            logger.info("Model still loading, queueing transcription")
+            self.transcription_progress.emit("Waiting for Whisper model to load...")
             return
 
-        # Check if model needs reloading to prevent memory accumulation
-        self._transcription_count += 1
-        if self._transcription_count >= self.MODEL_RELOAD_INTERVAL:
-            logger.info(f"Transcription count ({self._transcription_count}) reached reload interval")
-            self.reload_model()
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(self.BATCH_WINDOW_MS, self._flush_pending)
+
+    def _flush_pending(self):
+        """Start a worker for every queued recording"""
+        self._flush_scheduled = False
+        if not self._pending_files or self.model is None:
+            return
+
+        # The model is kept for the life of the process; only an OOM replaces it.
+        # No new batches start on it once that happens: the reload runs as soon
+        # as the running workers are cleaned up.
+        if self._reload_pending:
+            if not self._running_workers():
+                self.reload_model()
+            return
+
+        if self._running_workers() >= NUM_WORKERS:
+            # Picked up again once a worker is cleaned up
+            logger.info("All transcription workers busy, keeping recordings queued")
+            return
+
+        batch = self._pending_files
+        self._pending_files = []
 
         # #region agent log
-        _debug_log("E", "transcribe_file", "start", {"audio_file": audio_file, "custom_words_cached": bool(self.custom_words), "hotwords_in_cache": len(self.custom_words.get("hotwords","")), "transcription_count": self._transcription_count})
+        _debug_log("E", "transcribe_file", "start", {"audio_files": batch, "custom_words_cached": bool(self.custom_words), "hotwords_in_cache": len(self._hotwords)})
         # #endregion
         self.transcription_progress.emit("Starting transcription...")
 
-        settings = Settings()
-        language = settings.get('language', 'auto')
-
-        self.worker = TranscriptionWorker(self.model, audio_file, language, self.custom_words)
-        # Use QueuedConnection for thread-safe signal delivery from worker thread
-        self.worker.finished.connect(self.transcription_finished, Qt.ConnectionType.QueuedConnection)
-        self.worker.progress.connect(self.transcription_progress, Qt.ConnectionType.QueuedConnection)
-        self.worker.error.connect(self.transcription_error, Qt.ConnectionType.QueuedConnection)
-        self.worker.finished.connect(self._schedule_worker_cleanup, Qt.ConnectionType.QueuedConnection)
-        self.worker.oom_error.connect(self._handle_oom_error, Qt.ConnectionType.QueuedConnection)
-        self.worker.start()
+        # Each worker gets its own (cheap) pipeline wrapper; ctranslate2 runs
+        # concurrent calls on the shared model in its NUM_WORKERS internal slots
+        worker = TranscriptionWorker(self.model, batch, self._language, self._transcribe_kwargs_template,
+                                     self._replacements, BatchedInferencePipeline(model=self.model),
+                                     self._batch_size)
+        # AutoConnection queues these: they are emitted from the worker thread
+        # and this object lives on the main thread
+        worker.finished.connect(self.transcription_finished)
+        worker.progress.connect(self.transcription_progress)
+        worker.error.connect(self.transcription_error)
+        worker.finished.connect(self._schedule_worker_cleanup)
+        worker.error.connect(self._schedule_worker_cleanup)
+        worker.oom_error.connect(self._handle_oom_error)
+        self._workers.append(worker)
+        worker.start()
 
     def _handle_oom_error(self):
         """Handle OOM error by scheduling a model reload after worker finishes"""
         logger.warning("OOM error detected, will reload model on next transcription")
-        # Force reload on next transcription by setting count to threshold
-        self._transcription_count = self.MODEL_RELOAD_INTERVAL
+        self._reload_pending = True